@@ -2,21 +2,28 @@ from groq import Groq
 import os
 from dotenv import load_dotenv
 import streamlit as st
+from agents.router import ModelRouter, offline_mode
 
 # Load local .env if running locally
 load_dotenv()
 
 class AdviceAgent:
     def __init__(self):
-        # Try Streamlit secrets first, fallback to .env
-        api_key = (
-            st.secrets.get("GROQ_API_KEY")
-            if hasattr(st, "secrets") and "GROQ_API_KEY" in st.secrets
-            else os.getenv("GROQ_API_KEY")
-        )
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found in Streamlit secrets or .env file.")
-        self.client = Groq(api_key=api_key)
+        # Offline mode never calls the API, so it doesn't need a key
+        if offline_mode():
+            self.client = None
+        else:
+            # Try Streamlit secrets first, fallback to .env
+            api_key = (
+                st.secrets.get("GROQ_API_KEY")
+                if hasattr(st, "secrets") and "GROQ_API_KEY" in st.secrets
+                else os.getenv("GROQ_API_KEY")
+            )
+            if not api_key:
+                raise ValueError("GROQ_API_KEY not found in Streamlit secrets or .env file.")
+            # Retries would outlive the router's SLO; it falls back instead
+            self.client = Groq(api_key=api_key, max_retries=0)
+        self.router = ModelRouter(self.client)
 
     def give_advice(self, topic, score, total, plan_summary=None):
         """Generate personalized learning advice"""
@@ -36,12 +43,34 @@ class AdviceAgent:
         if plan_summary:
             user_prompt += f"\nTheir plan summary: {plan_summary}"
 
-        resp = self.client.chat.completions.create(
-            model="llama-3.1-8b-instant",
+        advice = self.router.complete(
+            "advice",
             messages=[
                 {"role": "system", "content": "You are an experienced academic coach giving actionable learning advice."},
                 {"role": "user", "content": user_prompt}
             ]
         )
 
-        return resp.choices[0].message.content.strip()
+        # Fall back to rule-based advice when the model is unavailable
+        if not advice:
+            return self._rule_based_advice(topic, accuracy, user_level)
+        return advice
+
+    def _rule_based_advice(self, topic, accuracy, user_level):
+        """Canned advice for each accuracy band."""
+        if user_level == "beginner":
+            focus = f"Go back over the fundamentals of {topic} before moving on."
+            method = "Re-read your notes, then make flashcards for key terms and definitions."
+        elif user_level == "intermediate":
+            focus = f"Review the questions you missed and the {topic} concepts behind them."
+            method = "Practice with worked examples and explain each answer in your own words."
+        else:
+            focus = f"You have a solid grasp of {topic}; move on to more advanced material."
+            method = "Challenge yourself with harder problems or teach the topic to someone else."
+
+        return (
+            f"You scored {accuracy}% on {topic}.\n\n"
+            f"1. **Focus next:** {focus}\n"
+            f"2. **How to study:** {method}\n"
+            f"3. **Retention:** Take a short quiz every few days and space out your reviews. Keep going!"
+        )
@@ -0,0 +1,88 @@
+import json
+import os
+import random
+import re
+from functools import lru_cache
+
+# Stored plans and quiz banks, keyed by lower-case topic
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.json")
+
+# Phases used to template a plan when no stored plan fits the request
+PLAN_PHASES = [
+    ("Foundations", "Learn the core definitions and terminology of {topic}."),
+    ("Core Concepts", "Work through the main ideas of {topic} with small examples."),
+    ("Practice", "Solve exercises on {topic} and note anything that feels unclear."),
+    ("Deeper Topics", "Study the harder parts of {topic} and connect them to what you already know."),
+    ("Review", "Revisit your notes on {topic} and test yourself without looking."),
+]
+
+
+@lru_cache(maxsize=1)
+def load_study_data():
+    try:
+        with open(DATA_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Could not load study data: {e}")
+        return {}
+
+
+def topic_name(topic):
+    """Strip the " (Difficulty: ...)" suffix the planner page adds to the topic."""
+    return re.sub(r"\s*\(.*\)\s*$", "", topic)
+
+
+def find_topic(topic):
+    """Return the stored entry whose key is a whole word of topic (e.g. "Java (Difficulty: Beginner)"), or None."""
+    name = topic_name(topic).lower()
+    for key, entry in load_study_data().items():
+        if re.search(rf"\b{re.escape(key)}\b", name):
+            return entry
+    return None
+
+
+def plan_length(plan):
+    """Return the (days, hours per day) a stored plan was written for, or None if it doesn't say."""
+    days = re.search(r"(\d+)-day", plan)
+    hours = re.search(r"(\d+) hours?\b[^.\n]*?per day", plan)
+    if not days or not hours:
+        return None
+    return int(days.group(1)), int(hours.group(1))
+
+
+def template_plan(topic, days, hours):
+    """Return the stored plan for topic if it has the requested length, otherwise a templated day-by-day plan."""
+    entry = find_topic(topic)
+    if entry and entry.get("plan") and plan_length(entry["plan"]) == (days, hours):
+        return entry["plan"]
+
+    topic = topic_name(topic)
+    lines = [f"Here's a {days}-day study plan for {topic}, with about {hours} hours of study per day:\n"]
+    for day in range(1, days + 1):
+        # Spread the phases evenly over the available days
+        name, task = PLAN_PHASES[(day - 1) * len(PLAN_PHASES) // days]
+        lines.append(f"**Day {day}: {name} ({hours} hours)**\n")
+        lines.append(f"- {task.format(topic=topic)}")
+        lines.append("- Finish with a 10-minute review of what you covered today.\n")
+    return "\n".join(lines)
+
+
+def sample_quiz(topic, num_questions):
+    """Sample up to num_questions stored questions for topic."""
+    entry = find_topic(topic)
+    if not entry:
+        return []
+    questions = [q for q in (_normalize_question(q) for q in entry.get("quiz", [])) if q]
+    return random.sample(questions, min(num_questions, len(questions)))
+
+
+def _normalize_question(q):
+    # Stored answers are often just the letter ("D") of an option like "D) ..."
+    answer = q.get("answer", "")
+    options = q.get("options", [])
+    if answer in options:
+        return dict(q)
+    for option in options:
+        if option.startswith(f"{answer})"):
+            return {**q, "answer": option}
+    return None
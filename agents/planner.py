@@ -1,17 +1,25 @@
 from groq import Groq
 import os
 from dotenv import load_dotenv
+from agents.router import ModelRouter, offline_mode
+from agents.offline import template_plan
 
 # Load environment variables from .env or Streamlit secrets
 load_dotenv()
 
 class PlannerAgent:
     def __init__(self):
-        # Get API key from environment (works locally + Streamlit Cloud)
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("Missing GROQ_API_KEY. Please set it in Streamlit secrets or .env file.")
-        self.client = Groq(api_key=api_key)
+        # Offline mode never calls the API, so it doesn't need a key
+        if offline_mode():
+            self.client = None
+        else:
+            # Get API key from environment (works locally + Streamlit Cloud)
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key:
+                raise ValueError("Missing GROQ_API_KEY. Please set it in Streamlit secrets or .env file.")
+            # Retries would outlive the router's SLO; it falls back instead
+            self.client = Groq(api_key=api_key, max_retries=0)
+        self.router = ModelRouter(self.client)
 
     def create_plan(self, topic, days, hours):
         """Generate a structured study plan."""
@@ -25,21 +33,17 @@ class PlannerAgent:
         - Use short, action-focused sentences.
         """
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are an expert academic planner creating clear, actionable schedules."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1200
-            )
+        plan_text = self.router.complete(
+            "plan",
+            messages=[
+                {"role": "system", "content": "You are an expert academic planner creating clear, actionable schedules."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=1200
+        )
 
-            # Extract plan text
-            plan_text = response.choices[0].message.content.strip()
-            return plan_text
-
-        except Exception as e:
-            print(f"Error generating plan: {e}")
-            return "⚠️ Error: Could not generate a study plan. Check your API key or connection."
+        # Fall back to a stored or templated plan when the model is unavailable
+        if not plan_text:
+            return template_plan(topic, days, hours)
+        return plan_text
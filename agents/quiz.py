@@ -1,27 +1,113 @@
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from groq import Groq
 import os
 from dotenv import load_dotenv
 import streamlit as st
+from agents.router import ModelRouter, offline_mode
+from agents.offline import sample_quiz
 
 # Load local .env file if it exists
 load_dotenv()
 
+# Questions per shard; large quizzes are split into several smaller requests
+MAX_SHARD_SIZE = 5
+
+# Sub-topic hints so parallel shards don't ask the same questions
+SHARD_HINTS = [
+    "core definitions and terminology",
+    "practical applications and worked examples",
+    "common mistakes and misconceptions",
+    "relationships and comparisons between key ideas",
+    "advanced details and edge cases",
+    "history, context and motivation",
+]
+
+# Shared across agent instances (app.py re-creates agents on every rerun).
+# The first shard of every quiz gets its own pool so a student waiting to start
+# never queues behind the remaining shards of other students' quizzes.
+_first_shard_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="quiz-first-shard")
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="quiz-shard")
+
 class QuizAgent:
     def __init__(self):
-        # Try Streamlit secrets first, fallback to .env
-        api_key = (
-            st.secrets.get("GROQ_API_KEY")
-            if hasattr(st, "secrets") and "GROQ_API_KEY" in st.secrets
-            else os.getenv("GROQ_API_KEY")
-        )
-        if not api_key:
-            raise ValueError("GROQ_API_KEY not found in Streamlit secrets or .env file.")
-        self.client = Groq(api_key=api_key)
+        # Offline mode never calls the API, so it doesn't need a key
+        if offline_mode():
+            self.client = None
+        else:
+            # Try Streamlit secrets first, fallback to .env
+            api_key = (
+                st.secrets.get("GROQ_API_KEY")
+                if hasattr(st, "secrets") and "GROQ_API_KEY" in st.secrets
+                else os.getenv("GROQ_API_KEY")
+            )
+            if not api_key:
+                raise ValueError("GROQ_API_KEY not found in Streamlit secrets or .env file.")
+            # Retries would outlive the router's SLO; it falls back instead
+            self.client = Groq(api_key=api_key, max_retries=0)
+        self.router = ModelRouter(self.client)
 
     def generate_quiz(self, topic, num_questions=5):
-        prompt = f"""Generate exactly {num_questions} multiple choice questions about {topic}.
+        """Generate a quiz, running the shards in parallel and merging the results."""
+        questions, _ = self.collect_ready([], self.start_quiz(topic, num_questions), num_questions, block=True)
+        return questions if questions else None
+
+    def start_quiz(self, topic, num_questions=5):
+        """Submit one request per shard and return the pending futures, first shard first."""
+        (first_count, first_hint), *rest = self._plan_shards(num_questions)
+        return [_first_shard_executor.submit(self._generate_shard, topic, first_count, first_hint)] + [
+            _executor.submit(self._generate_shard, topic, count, hint)
+            for count, hint in rest
+        ]
+
+    def wait_first(self, futures, num_questions):
+        """Block until some shard returns questions; return them with the still-pending futures."""
+        questions, pending = [], list(futures)
+        while pending and not questions:
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                questions = self.merge_questions(questions, future.result(), num_questions)
+            pending = list(not_done)
+        return questions, pending
+
+    def collect_ready(self, questions, futures, num_questions, block=False):
+        """Merge any finished shards into questions; return the updated list and pending futures."""
+        if block:
+            wait(futures)
+        pending = []
+        for future in futures:
+            if future.done():
+                questions = self.merge_questions(questions, future.result(), num_questions)
+            else:
+                pending.append(future)
+        return questions, pending
+
+    def merge_questions(self, questions, new_questions, limit=None):
+        """Append new_questions to questions, skipping duplicates by question text."""
+        merged = list(questions)
+        seen = {self._question_key(q) for q in merged}
+        for q in new_questions or []:
+            if limit is not None and len(merged) >= limit:
+                break
+            key = self._question_key(q)
+            if key not in seen:
+                seen.add(key)
+                merged.append(q)
+        return merged
+
+    def _plan_shards(self, num_questions):
+        """Split num_questions into evenly sized shards of at most MAX_SHARD_SIZE, each with its own hint."""
+        num_shards = max(1, -(-num_questions // MAX_SHARD_SIZE))
+        base, extra = divmod(num_questions, num_shards)
+        counts = [base + (1 if i < extra else 0) for i in range(num_shards)]
+        if num_shards == 1:
+            return [(counts[0], None)]
+        return [(count, SHARD_HINTS[i % len(SHARD_HINTS)]) for i, count in enumerate(counts)]
+
+    def _generate_shard(self, topic, num_questions, hint=None):
+        focus = f"\nFocus on {hint}." if hint else ""
+        prompt = f"""Generate exactly {num_questions} multiple choice questions about {topic}.{focus}
 
 Return ONLY a valid JSON array with this exact structure:
 [
@@ -38,34 +124,36 @@ Requirements:
 - The answer must be one of the options (exact match)
 - No markdown, no explanations, just JSON"""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are a quiz generator that returns only valid JSON arrays."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+        text = self.router.complete(
+            "quiz",
+            messages=[
+                {"role": "system", "content": "You are a quiz generator that returns only valid JSON arrays."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000
+        )
 
-            text = response.choices[0].message.content.strip()
+        # Sample from the stored question bank when the model is unavailable
+        if not text:
+            return sample_quiz(topic, num_questions)
+
+        try:
             text = self._clean_json_response(text)
             quiz_data = json.loads(text)
 
             if not isinstance(quiz_data, list) or len(quiz_data) == 0:
                 print("Error: Empty or invalid quiz response.")
-                return None
+                return []
 
-            valid_questions = [q for i, q in enumerate(quiz_data) if self._validate_question(q, i)]
-            return valid_questions if valid_questions else None
+            return [q for i, q in enumerate(quiz_data) if self._validate_question(q, i)]
 
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
-            return None
+            return []
         except Exception as e:
             print(f"Error generating quiz: {e}")
-            return None
+            return []
 
     def _clean_json_response(self, text):
         text = re.sub(r'```json\s*', '', text)
@@ -80,8 +168,15 @@ Requirements:
             return False
         if not all(k in q for k in ['question', 'options', 'answer']):
             return False
+        if not isinstance(q['question'], str) or not q['question'].strip():
+            return False
         if not isinstance(q['options'], list) or len(q['options']) != 4:
             return False
+        if not all(isinstance(option, str) for option in q['options']):
+            return False
         if q['answer'] not in q['options']:
             return False
         return True
+
+    def _question_key(self, q):
+        return re.sub(r'\W+', ' ', q['question']).strip().lower()
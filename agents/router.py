@@ -0,0 +1,103 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Model and latency budget per task. "slo" is the number of seconds we wait for
+# the remote model before giving up and using the local fallback; tasks with
+# "hedge" fire a second attempt once the first is slower than our observed p95.
+# The model can be overridden per task, e.g. STUDY_COACH_QUIZ_MODEL=...
+# "workers" sizes the task's own call pool, so one task's load never queues
+# another's calls: quiz allows a first attempt and a hedge for each of the
+# 16 + 32 shard threads in agents/quiz.py, plus headroom.
+ROUTES = {
+    "plan": {"model": "llama-3.1-8b-instant", "slo": 20.0, "hedge": False, "workers": 16},
+    "quiz": {"model": "llama-3.1-8b-instant", "slo": 15.0, "hedge": True, "workers": 100},
+    "advice": {"model": "llama-3.1-8b-instant", "slo": 8.0, "hedge": True, "workers": 32},
+}
+
+# Hedge delay used until we have enough latency samples to estimate a p95
+DEFAULT_HEDGE_DELAY = 3.0
+MIN_LATENCY_SAMPLES = 20
+
+# Shared across agent instances (app.py re-creates agents on every rerun)
+_executors = {
+    task: ThreadPoolExecutor(max_workers=route["workers"], thread_name_prefix=f"model-call-{task}")
+    for task, route in ROUTES.items()
+}
+_latencies = {task: deque(maxlen=200) for task in ROUTES}
+_latency_lock = threading.Lock()
+
+
+def offline_mode():
+    """True when STUDY_COACH_OFFLINE is set and every task should use its local fallback."""
+    return bool(os.getenv("STUDY_COACH_OFFLINE"))
+
+
+class ModelRouter:
+    def __init__(self, client):
+        self.client = client
+
+    def complete(self, task, messages, **kwargs):
+        """Return the completion text for task, or None if the remote model failed or missed its SLO."""
+        if offline_mode() or self.client is None:
+            return None
+
+        route = ROUTES[task]
+        executor = _executors[task]
+        deadline = time.monotonic() + route["slo"]
+        attempts = [executor.submit(self._call, task, messages, kwargs, deadline)]
+
+        # Hedge only on slowness; retrying straight away on an error (e.g. a 429)
+        # would just add load while the upstream is struggling
+        if route["hedge"]:
+            done, _ = wait(attempts, timeout=min(self.hedge_delay(task), route["slo"]))
+            if not done:
+                attempts.append(executor.submit(self._call, task, messages, kwargs, deadline))
+
+        pending = set(attempts)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"Model call for '{task}' exceeded its {route['slo']}s SLO, using local fallback.")
+                    return None
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    print(f"Model call for '{task}' failed: {future.exception()}")
+            return None
+        finally:
+            # Drop queued attempts nobody is waiting for; running ones stop at the deadline
+            for future in pending:
+                future.cancel()
+
+    def model_for(self, task):
+        return os.getenv(f"STUDY_COACH_{task.upper()}_MODEL", ROUTES[task]["model"])
+
+    def hedge_delay(self, task):
+        """p95 latency of recent successful calls for task, or the default while we have too few samples."""
+        with _latency_lock:
+            samples = sorted(_latencies[task])
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def _call(self, task, messages, kwargs, deadline):
+        # Every attempt shares the caller's deadline, however late it left the queue
+        start = time.monotonic()
+        remaining = deadline - start
+        if remaining <= 0:
+            raise TimeoutError("deadline passed before the call started")
+        response = self.client.chat.completions.create(
+            model=self.model_for(task),
+            messages=messages,
+            timeout=remaining,
+            **kwargs
+        )
+        text = response.choices[0].message.content.strip()
+        with _latency_lock:
+            _latencies[task].append(time.monotonic() - start)
+        return text
@@ -57,6 +57,8 @@ defaults = {
     "days": 1,
     "hours": 1,
     "quiz_data": None,
+    "quiz_pending": [],  # Quiz shards still being generated
+    "quiz_target": 0,
     "quiz_running": False,
     "current_q": 0,
     "user_answers": {},
@@ -216,6 +218,7 @@ elif page == "📖 Study Planner":
                 st.session_state.days = days
                 st.session_state.hours = hours
                 st.session_state.quiz_data = None
+                st.session_state.quiz_pending = []
                 st.session_state.quiz_running = False
                 st.session_state.quiz_completed = False
                 st.balloons()
@@ -246,17 +249,24 @@ elif page == "🧩 Take Quiz":
         if not st.session_state.quiz_running and not st.session_state.quiz_completed:
             st.info(f"📚 Ready to test your knowledge on **{st.session_state.topic}**?")
             
+            exam_mode = st.checkbox("🎓 Exam prep mode (longer quizzes)")
+            max_questions = 30 if exam_mode else 10
+            
             col1, col2 = st.columns(2)
             with col1:
-                num_questions = st.slider("Number of Questions", 3, 10, 5)
+                num_questions = st.slider("Number of Questions", 3, max_questions, 5)
             with col2:
                 time_per_q = st.slider("Time per Question (seconds)", 10, 30, 15)
             
             if st.button("🎯 Start Quiz", use_container_width=True, type="primary"):
                 with st.spinner("Generating quiz..."):
-                    quiz_data = quiz_agent.generate_quiz(st.session_state.topic, num_questions)
+                    # Start as soon as the first shard lands; the rest are merged in on later reruns
+                    shards = quiz_agent.start_quiz(st.session_state.topic, num_questions)
+                    quiz_data, pending = quiz_agent.wait_first(shards, num_questions)
                 if quiz_data:
                     st.session_state.quiz_data = quiz_data
+                    st.session_state.quiz_pending = pending
+                    st.session_state.quiz_target = num_questions
                     st.session_state.quiz_running = True
                     st.session_state.current_q = 0
                     st.session_state.user_answers = {}
@@ -270,6 +280,13 @@ elif page == "🧩 Take Quiz":
         
         # Quiz Execution
         if st.session_state.quiz_running and st.session_state.quiz_data and not st.session_state.quiz_completed:
+            if st.session_state.quiz_pending:
+                st.session_state.quiz_data, st.session_state.quiz_pending = quiz_agent.collect_ready(
+                    st.session_state.quiz_data,
+                    st.session_state.quiz_pending,
+                    st.session_state.quiz_target
+                )
+            
             quiz = st.session_state.quiz_data
             total_q = len(quiz)
             qidx = st.session_state.current_q
@@ -285,7 +302,9 @@ elif page == "🧩 Take Quiz":
                 remaining = max(0, duration - elapsed)
                 
                 # Progress
-                st.progress((qidx) / total_q, text=f"Question {qidx + 1} of {total_q}")
+                # Show the requested total while later shards are still arriving
+                shown_total = st.session_state.quiz_target if st.session_state.quiz_pending else total_q
+                st.progress((qidx) / shown_total, text=f"Question {qidx + 1} of {shown_total}")
                 
                 col1, col2 = st.columns([3, 1])
                 with col1:
@@ -312,6 +331,15 @@ elif page == "🧩 Take Quiz":
                 else:
                     time.sleep(0.5)
                     st.rerun()
+            elif st.session_state.quiz_pending:
+                with st.spinner("Loading more questions..."):
+                    st.session_state.quiz_data, st.session_state.quiz_pending = quiz_agent.collect_ready(
+                        st.session_state.quiz_data,
+                        st.session_state.quiz_pending,
+                        st.session_state.quiz_target,
+                        block=True
+                    )
+                st.rerun()
             else:
                 st.session_state.quiz_running = False
                 st.session_state.quiz_completed = True
@@ -379,6 +407,7 @@ elif page == "🧩 Take Quiz":
             with col1:
                 if st.button("🔄 Take Another Quiz", use_container_width=True):
                     st.session_state.quiz_data = None
+                    st.session_state.quiz_pending = []
                     st.session_state.quiz_running = False
                     st.session_state.quiz_completed = False
                     st.session_state.current_q = 0
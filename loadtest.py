@@ -0,0 +1,378 @@
+"""Headless load test for app.py.
+
+Drives the real Streamlit app with AppTest against stubbed agents, running
+simulated students concurrently: create a plan, take a timed quiz, read the
+results and open the analytics page. Each concurrency level runs in a fresh
+process and the report is written as JSON so runs can be compared between
+releases.
+
+The harness depends on a specific Streamlit release; install it with
+
+    pip install -r requirements-loadtest.txt
+    python loadtest.py --concurrency 1 2 4 8 --output loadtest_report.json
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# Runs app.py and records wall and CPU time for every rerun in session state
+WRAPPER = f'''
+import time
+import streamlit as st
+
+_wall, _cpu = time.perf_counter(), time.thread_time()
+try:
+    exec(compile(open({APP_PATH!r}, encoding="utf-8").read(), {APP_PATH!r}, "exec"))
+finally:
+    st.session_state.setdefault("_loadtest_reruns", []).append(
+        (time.perf_counter() - _wall, time.thread_time() - _cpu)
+    )
+'''
+
+TOPICS = ["Java", "Calculus", "Trigonometry", "World History", "Organic Chemistry"]
+
+# share_apptest_runtime patches Streamlit internals that change between releases;
+# re-check it and bump this together with the pin in requirements-loadtest.txt
+SUPPORTED_STREAMLIT = (1, 66)
+
+# Question limits of the quiz page sliders, without and with exam prep mode
+MIN_QUESTIONS, MAX_QUESTIONS, MAX_EXAM_QUESTIONS = 3, 10, 30
+
+
+def check_streamlit_version():
+    import streamlit
+
+    version = tuple(int(part) for part in streamlit.__version__.split(".")[:2])
+    if version != SUPPORTED_STREAMLIT:
+        supported = ".".join(map(str, SUPPORTED_STREAMLIT))
+        raise RuntimeError(
+            f"loadtest.py supports Streamlit {supported}.x only, found {streamlit.__version__}. "
+            "Run `pip install -r requirements-loadtest.txt`, or check share_apptest_runtime "
+            "against the new AppTest before updating SUPPORTED_STREAMLIT."
+        )
+
+
+def share_apptest_runtime():
+    """Let AppTest sessions run in parallel threads.
+
+    AppTest installs a mock Runtime and patches config around every run, which
+    breaks as soon as two runs overlap. Pin the first mock Runtime for the whole
+    process (a real server also shares one Runtime between sessions) and set the
+    config override once.
+    """
+    check_streamlit_version()
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    pinned = []
+
+    def current(cls):
+        if not pinned and cls._instance is not None:
+            pinned.append(cls._instance)
+        return pinned[0] if pinned else None
+
+    def instance(cls):
+        runtime = current(cls)
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: current(cls) is not None)
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+
+def quiet_streamlit_logs():
+    """Only log Streamlit errors; student threads have no ScriptRunContext, so it warns on every rerun."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    # Parse the config first, otherwise parsing it later resets the level
+    config.get_config_options()
+    set_log_level("error")
+
+
+def install_stub_agents(latency):
+    """Replace the agent classes app.py imports with offline stubs that sleep for latency seconds."""
+    import agents.advice
+    import agents.planner
+    import agents.quiz
+
+    class StubRouter:
+        def complete(self, task, messages, **kwargs):
+            time.sleep(latency)
+            if task == "plan":
+                return "\n".join(f"**Day {day}:** Study and review." for day in range(1, 8))
+            return "Keep practising and review the questions you missed."
+
+    class StubPlannerAgent(agents.planner.PlannerAgent):
+        def __init__(self):
+            self.router = StubRouter()
+
+    class StubAdviceAgent(agents.advice.AdviceAgent):
+        def __init__(self):
+            self.router = StubRouter()
+
+    class StubQuizAgent(agents.quiz.QuizAgent):
+        def __init__(self):
+            self.router = StubRouter()
+
+        def _generate_shard(self, topic, num_questions, hint=None):
+            time.sleep(latency)
+            # Every question shares the same options and "Option A" is always correct
+            return [
+                {
+                    "question": f"{topic} question {i + 1} on {hint or 'the basics'}?",
+                    "options": ["Option A", "Option B", "Option C", "Option D"],
+                    "answer": "Option A",
+                }
+                for i in range(num_questions)
+            ]
+
+    agents.planner.PlannerAgent = StubPlannerAgent
+    agents.advice.AdviceAgent = StubAdviceAgent
+    agents.quiz.QuizAgent = StubQuizAgent
+
+
+def run_student(student_id, args, results):
+    """Run one student journey, append its timings to results and return its AppTest.
+
+    Raises if any step doesn't end in the state a real student would see.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(args.seed * 1000 + student_id)
+    steps = {}
+    at = AppTest.from_string(WRAPPER, default_timeout=args.step_timeout)
+
+    def step(name, action):
+        start = time.perf_counter()
+        action()
+        steps[name] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{name} failed: {at.exception[0].message}")
+
+    def expect(name, ok, what):
+        if not ok:
+            raise RuntimeError(f"{name} failed: expected {what}")
+
+    def click(label):
+        next(b for b in at.button if b.label == label).click().run()
+
+    def create_plan():
+        at.text_input[0].set_value(rng.choice(TOPICS))
+        click("🚀 Generate Study Plan")
+
+    def take_quiz():
+        if args.questions > MAX_QUESTIONS:
+            at.checkbox[0].set_value(True).run()
+        at.slider[0].set_value(args.questions)
+        at.slider[1].set_value(args.time_per_question)
+        # Pre-select each answer; the radio for question i picks it up when it is shown
+        for i in range(args.questions):
+            correct = rng.random() < args.accuracy
+            at.session_state[f"timed_q_{i}"] = "Option A" if correct else rng.choice(["Option B", "Option C", "Option D"])
+        click("🎯 Start Quiz")
+
+    step("open_dashboard", at.run)
+    step("open_planner", lambda: at.sidebar.radio[0].set_value("📖 Study Planner").run())
+    step("create_plan", create_plan)
+    expect("create_plan", at.session_state.plan, "a study plan")
+    step("open_quiz", lambda: at.sidebar.radio[0].set_value("🧩 Take Quiz").run())
+    step("take_quiz", take_quiz)
+    expect("take_quiz", at.session_state.quiz_completed, "a completed quiz")
+    expect("take_quiz", len(at.session_state.quiz_history) == 1, "one quiz in the history")
+    step("open_analytics", lambda: at.sidebar.radio[0].set_value("📊 Progress Analytics").run())
+    answered = [m.value for m in at.main.metric if m.label == "Questions Answered"]
+    expect("open_analytics", answered == [str(args.questions)], f"{args.questions} questions answered on the analytics page")
+
+    results.append({"steps": steps, "reruns": list(at.session_state["_loadtest_reruns"])})
+    return at
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda p: values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+    return {
+        "p50": round(pick(50) * 1000, 2),
+        "p90": round(pick(90) * 1000, 2),
+        "p95": round(pick(95) * 1000, 2),
+        "p99": round(pick(99) * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+def run_level(concurrency, args, results_queue):
+    """Run concurrency students at once in this (fresh) process and put the summary on results_queue."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    install_stub_agents(args.agent_latency)
+    share_apptest_runtime()
+    quiet_streamlit_logs()
+
+    # One student on their own first, so lazy imports aren't counted against the level
+    run_student(-1, args, [])
+
+    results, errors, apps = [], [], []
+
+    def student(i):
+        try:
+            apps.append(run_student(i, args, results))
+        except Exception as e:
+            errors.append(f"student {i}: {e}")
+
+    # Sample RSS throughout the level; finished sessions stay in apps so the peak covers all of them
+    rss_before = rss_kb()
+    rss_peak = [rss_before]
+    sampling = threading.Event()
+
+    def sample_rss():
+        while not sampling.wait(0.1):
+            rss_peak[0] = max(rss_peak[0], rss_kb())
+
+    sampler = threading.Thread(target=sample_rss)
+    sampler.start()
+    cpu_before = time.process_time()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=student, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_before
+    sampling.set()
+    sampler.join()
+    rss_peak[0] = max(rss_peak[0], rss_kb())
+    apps.clear()
+
+    reruns = [r for result in results for r in result["reruns"]]
+    page_latencies = [
+        seconds for result in results
+        for name, seconds in result["steps"].items() if name != "take_quiz"
+    ]
+    results_queue.put({
+        "concurrency": concurrency,
+        "students_completed": len(results),
+        "errors": errors,
+        "wall_seconds": round(wall, 2),
+        "reruns": len(reruns),
+        "reruns_per_second": round(len(reruns) / wall, 2),
+        "process_cpu_seconds": round(cpu, 2),
+        "cpu_utilization": round(cpu / wall, 3),
+        "cpu_ms_per_rerun": percentiles([c for _, c in reruns]),
+        "cpu_ms_per_rerun_mean": round(statistics.mean(c for _, c in reruns) * 1000, 2) if reruns else None,
+        "memory_kb_per_session": round((rss_peak[0] - rss_before) / concurrency, 1),
+        "page_latency_ms": percentiles(page_latencies),
+        "quiz_duration_ms": percentiles([r["steps"]["take_quiz"] for r in results]),
+    })
+
+
+def wait_for_level(process, results):
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"Load test process exited with code {process.exitcode}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless load test for the Study Coach app.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrent students per level")
+    parser.add_argument(
+        "--questions", type=int, default=3,
+        help=f"Questions per quiz ({MIN_QUESTIONS}-{MAX_EXAM_QUESTIONS}; more than {MAX_QUESTIONS} uses exam prep mode)"
+    )
+    parser.add_argument("--time-per-question", type=int, default=10, help="Quiz timer in seconds (10-30)")
+    parser.add_argument("--accuracy", type=float, default=0.6, help="Chance a simulated student answers correctly")
+    parser.add_argument("--agent-latency", type=float, default=0.0, help="Seconds each stubbed agent call sleeps")
+    parser.add_argument("--step-timeout", type=float, default=600.0, help="Seconds before a single step is failed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="loadtest_report.json")
+    args = parser.parse_args()
+    if not MIN_QUESTIONS <= args.questions <= MAX_EXAM_QUESTIONS:
+        parser.error(f"--questions must be between {MIN_QUESTIONS} and {MAX_EXAM_QUESTIONS}")
+    if not 10 <= args.time_per_question <= 30:
+        parser.error("--time-per-question must be between 10 and 30")
+    if not 0 <= args.accuracy <= 1:
+        parser.error("--accuracy must be between 0 and 1")
+    if any(c < 1 for c in args.concurrency):
+        parser.error("--concurrency levels must be at least 1")
+    check_streamlit_version()
+
+    import streamlit
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": vars(args),
+        "levels": [],
+    }
+
+    # A fresh process per level keeps memory and CPU numbers independent
+    ctx = multiprocessing.get_context("spawn")
+    for concurrency in args.concurrency:
+        results = ctx.Queue()
+        process = ctx.Process(target=run_level, args=(concurrency, args, results))
+        process.start()
+        level = wait_for_level(process, results)
+        process.join()
+        report["levels"].append(level)
+        print(
+            f"{concurrency:>4} students | {level['reruns_per_second']:>7} reruns/s | "
+            f"cpu/rerun p50 {level['cpu_ms_per_rerun'].get('p50')} ms | "
+            f"page p95 {level['page_latency_ms'].get('p95')} ms | "
+            f"{level['memory_kb_per_session']} KB/session | {len(level['errors'])} errors"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()